@@ -1,107 +1,429 @@
 """Download reports from Azure Blob Storage using a SAS URL."""
 
 import argparse
+import functools
+import io
 import os
+import sys
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import date, datetime, timezone
 from email.utils import parsedate_to_datetime
-from urllib.parse import urlparse
+from typing import NamedTuple
+from urllib.parse import quote, urlparse
 from xml.etree import ElementTree
 
-import requests
-
 def _load_dotenv(path: str = ".env") -> None:
-    """Load simple KEY=VALUE pairs from a .env file into os.environ."""
-    if not os.path.exists(path):
+    """Load simple KEY=VALUE pairs from a .env file into os.environ.
+
+    Skipped entirely when BASE_SAS_URL is already set in the environment.
+    """
+    if os.getenv("BASE_SAS_URL"):
         return
 
-    with open(path, "r", encoding="utf-8") as f:
-        for raw_line in f:
-            line = raw_line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.strip().strip("'").strip('"')
-            if key:
-                os.environ.setdefault(key, value)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return
+
+    for raw_line in lines:
+        line = raw_line.strip()
+        if not line or line.startswith("#"):
+            continue
+        key, sep, value = line.partition("=")
+        key = key.strip()
+        if sep and key:
+            os.environ.setdefault(key, value.strip().strip("\"'"))
 
 
 _load_dotenv()
 
 BASE_SAS_URL = os.getenv("BASE_SAS_URL", "")
 DEFAULT_TIMEOUT = (10, 120)
-DEFAULT_CHUNK_SIZE = 256 * 1024
-
-# Shared session keeps TCP/TLS connections warm across requests.
-SESSION = requests.Session()
-
-
-def _sas_params(sas_url: str) -> str:
-    """Extract the query string (SAS token) from the full URL."""
+# Body reads adapt between these sizes; BLOB_DL_CHUNK pins a fixed size. Files
+# are written unbuffered, one write per chunk, and each read fills its chunk,
+# so every write except the last of a body is at least MIN_CHUNK_SIZE. A
+# pinned size below that is raised to it.
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+CHUNK_SIZE_OVERRIDE = int(os.getenv("BLOB_DL_CHUNK", "0"))
+if CHUNK_SIZE_OVERRIDE:
+    CHUNK_SIZE_OVERRIDE = max(CHUNK_SIZE_OVERRIDE, MIN_CHUNK_SIZE)
+# Full reads timed at each size before deciding whether to double it.
+_CHUNK_PROBE_READS = 4
+DEFAULT_CONCURRENCY = int(os.getenv("BLOB_DL_CONCURRENCY", "16"))
+
+# Blobs at least this large are fetched as PARALLEL_PARTS concurrent ranges.
+PARALLEL_THRESHOLD = 8 * 1024 * 1024
+PARALLEL_PARTS = 8
+
+# O_BINARY only exists (and matters) on Windows.
+_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+# Directories already created this run, so makedirs isn't re-run per blob.
+_DIR_CACHE: set[str] = set()
+
+# Shared session keeps TCP/TLS connections warm across requests. It is built
+# on first use so `--help` and argument errors don't pay for importing
+# requests; see _session().
+SESSION = None
+_POOL_SIZE = 0
+_SESSION_LOCK = threading.Lock()
+
+
+def _session(pool_size: int = 0):
+    """Return the shared requests session, creating it on first use.
+
+    The HTTPS pool holds at least 64 connections, or `pool_size` if larger,
+    so concurrent downloads don't evict keep-alive connections (requests
+    defaults to 10 per host); only a request for a larger pool remounts it.
+    Throttled or transient server errors are retried with backoff before
+    surfacing.
+    """
+    global SESSION, _POOL_SIZE
+    pool_size = max(pool_size, 64)
+    if SESSION is None or pool_size > _POOL_SIZE:
+        with _SESSION_LOCK:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            session = SESSION if SESSION is not None else requests.Session()
+            if pool_size > _POOL_SIZE:
+                session.mount(
+                    "https://",
+                    HTTPAdapter(
+                        pool_connections=64,
+                        pool_maxsize=pool_size,
+                        max_retries=Retry(
+                            total=5,
+                            backoff_factor=0.3,
+                            status_forcelist=(429, 500, 502, 503, 504),
+                            allowed_methods=("GET",),
+                            raise_on_status=False,
+                        ),
+                    ),
+                )
+                _POOL_SIZE = pool_size
+            SESSION = session
+    return SESSION
+
+
+class Blob(NamedTuple):
+    """A blob entry from a container listing."""
+
+    name: str
+    last_modified: str | None
+    size: int
+    content_encoding: str | None = None
+
+
+@functools.lru_cache(maxsize=4)
+def _split_sas(sas_url: str) -> tuple[str, str]:
+    """Split the SAS URL into (base URL, SAS query string).
+
+    Cached because the same URL is reused for every blob in a command.
+    """
     parsed = urlparse(sas_url)
-    return parsed.query
+    return f"{parsed.scheme}://{parsed.netloc}{parsed.path}", parsed.query
 
 
-def _base_url(sas_url: str) -> str:
-    """Extract the base URL (scheme + host + path) without query params."""
-    parsed = urlparse(sas_url)
-    return f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-
+def iter_blobs(sas_url: str = BASE_SAS_URL, prefix: str | None = None) -> Iterator[Blob]:
+    """Yield blobs in the container page by page.
 
-def list_blobs(sas_url: str = BASE_SAS_URL) -> list[dict]:
-    """List all blobs in the container. Returns list of {name, last_modified, size}."""
-    base = _base_url(sas_url)
-    params = _sas_params(sas_url)
-    blobs = []
+    Blobs are yielded as each page is parsed, so callers can start work
+    before the listing finishes. When `prefix` is given the service only
+    returns blobs whose names start with it.
+    """
+    base, params = _split_sas(sas_url)
     marker = None
 
     while True:
         url = f"{base}?restype=container&comp=list&{params}"
+        if prefix:
+            url += f"&prefix={quote(prefix, safe='')}"
         if marker:
             url += f"&marker={marker}"
 
-        resp = SESSION.get(url, timeout=DEFAULT_TIMEOUT)
+        resp = _session().get(url, timeout=DEFAULT_TIMEOUT)
         resp.raise_for_status()
 
-        root = ElementTree.fromstring(resp.content)
-        for blob in root.findall(".//Blob"):
-            name = blob.findtext("Name")
-            props = blob.find("Properties")
-            last_modified = props.findtext("Last-Modified") if props is not None else None
-            size = props.findtext("Content-Length") if props is not None else None
-            blobs.append(
-                {
-                    "name": name,
-                    "last_modified": last_modified,
-                    "size": int(size) if size else 0,
-                }
-            )
+        # Read the whole page before yielding anything: the caller may pause
+        # between blobs for a long time, and a half-read response left open
+        # that long would be reset by server or load-balancer idle timeouts.
+        # Each <Blob> is still dropped once read so the parsed tree stays small.
+        next_marker = None
+        container = None
+        page = io.BytesIO(resp.content)
+        for event, elem in ElementTree.iterparse(page, events=("start", "end")):
+            if event == "start":
+                if elem.tag == "Blobs":
+                    container = elem
+                continue
+            if elem.tag == "Blob":
+                name = elem.findtext("Name")
+                props = elem.find("Properties")
+                last_modified = props.findtext("Last-Modified") if props is not None else None
+                size = props.findtext("Content-Length") if props is not None else None
+                encoding = props.findtext("Content-Encoding") if props is not None else None
+                yield Blob(name, last_modified, int(size) if size else 0, encoding or None)
+                if container is not None:
+                    container.clear()
+            elif elem.tag == "NextMarker":
+                next_marker = elem.text
 
-        next_marker = root.findtext("NextMarker")
         if not next_marker:
             break
         marker = next_marker
 
-    return blobs
-
 
-def download_blob(blob_name: str, dest_dir: str = "downloads", sas_url: str = BASE_SAS_URL):
-    """Download a single blob to dest_dir, preserving subfolder structure."""
-    base = _base_url(sas_url)
-    params = _sas_params(sas_url)
-    blob_url = f"{base}/{blob_name}?{params}"
+def list_blobs(sas_url: str = BASE_SAS_URL, prefix: str | None = None) -> list[Blob]:
+    """List all blobs in the container."""
+    return list(iter_blobs(sas_url, prefix))
+
+
+def _iter_body(resp) -> Iterator[bytes]:
+    """Yield a streamed response body, growing the read size while it pays off.
+
+    Reads start at MIN_CHUNK_SIZE. Each size is timed over a few full reads;
+    if its throughput beat the previous size's, the size doubles (up to
+    MAX_CHUNK_SIZE), otherwise it is kept for the rest of the body. Only time
+    spent reading is measured, not the caller's writes.
+    """
+    # Read the raw stream directly rather than through iter_content; read(n)
+    # fills each chunk, so only the last one of a body can be short.
+    raw = resp.raw
+    raw.decode_content = True
+    read = raw.read
+    size = CHUNK_SIZE_OVERRIDE or MIN_CHUNK_SIZE
+    adaptive = not CHUNK_SIZE_OVERRIDE
+    best_rate = 0.0
+    reads = received = 0
+    elapsed = 0.0
+    while True:
+        started = time.perf_counter()
+        chunk = read(size)
+        if not chunk:
+            return
+        if adaptive:
+            elapsed += time.perf_counter() - started
+            received += len(chunk)
+            reads += 1
+        yield chunk
+        if adaptive and reads == _CHUNK_PROBE_READS:
+            rate = received / elapsed if elapsed > 0 else float("inf")
+            if rate > best_rate and size < MAX_CHUNK_SIZE:
+                best_rate = rate
+                size *= 2
+                reads = received = 0
+                elapsed = 0.0
+            else:
+                adaptive = False
+
+
+def download_blob(
+    blob_name: str,
+    dest_dir: str = "downloads",
+    sas_url: str = BASE_SAS_URL,
+    known_size: int | None = None,
+    known_last_modified: str | None = None,
+    known_encoding: str | None = None,
+) -> str | None:
+    """Download a single blob to dest_dir, preserving subfolder structure.
+
+    Returns the local path, or None when the existing local copy is already
+    current: its size and mtime exactly match the listed size/Last-Modified.
+    Anything else is downloaded again. For blobs stored with a Content-Encoding
+    the listed size is the encoded size, which never matches the decoded local
+    file, so only the mtime is compared.
+    """
+    base, params = _split_sas(sas_url)
+    blob_url = "".join((base, "/", blob_name, "?", params))
 
     out_path = os.path.join(dest_dir, blob_name)
-    os.makedirs(os.path.dirname(out_path) or dest_dir, exist_ok=True)
+    out_dir = os.path.dirname(out_path) or dest_dir
+    if out_dir not in _DIR_CACHE:
+        os.makedirs(out_dir, exist_ok=True)
+        _DIR_CACHE.add(out_dir)
+
+    if known_size is not None and known_last_modified and os.path.isfile(out_path):
+        stat = os.stat(out_path)
+        if (
+            (known_encoding or stat.st_size == known_size)
+            and int(stat.st_mtime) == _http_timestamp(known_last_modified)
+        ):
+            return None
+
+    if known_size and known_size >= PARALLEL_THRESHOLD and hasattr(os, "pwrite"):
+        _download_ranges(blob_url, out_path, known_size)
+    else:
+        _download_single(blob_url, out_path)
+    return out_path
 
-    with SESSION.get(blob_url, stream=True, timeout=DEFAULT_TIMEOUT) as resp:
+
+def _download_single(blob_url: str, out_path: str):
+    """Fetch a blob with one GET."""
+    with _session().get(blob_url, stream=True, timeout=DEFAULT_TIMEOUT) as resp:
         resp.raise_for_status()
-        with open(out_path, "wb") as f:
-            for chunk in resp.iter_content(chunk_size=DEFAULT_CHUNK_SIZE):
-                if chunk:
-                    f.write(chunk)
+        _write_stream(resp, out_path)
 
-    return out_path
+
+def _download_ranges(
+    blob_url: str,
+    out_path: str,
+    size: int,
+    parts: int = PARALLEL_PARTS,
+):
+    """Fetch a large blob as `parts` concurrent byte ranges.
+
+    The first range is requested up front; its response decides whether the
+    rest can be split (plain 206 body) or the blob has to be streamed whole.
+    Ranges are written into `out_path + ".part"`, which replaces `out_path`
+    only once complete.
+    """
+    part_size = -(-size // parts)
+    first_headers = {"Range": f"bytes=0-{part_size - 1}"}
+    with _session().get(
+        blob_url, headers=first_headers, stream=True, timeout=DEFAULT_TIMEOUT
+    ) as first:
+        first.raise_for_status()
+        if first.status_code != 206:
+            # Range ignored: this is already the whole blob.
+            _write_stream(first, out_path)
+            return
+        if first.headers.get("Content-Encoding"):
+            # Encoded bodies can only be decoded as a single stream.
+            first.close()
+            _download_single(blob_url, out_path)
+            return
+
+        total = int(first.headers["Content-Range"].rpartition("/")[2])
+        # Pin the remaining ranges to the same blob version as the first.
+        etag = first.headers.get("ETag")
+        part_headers = {"If-Match": etag} if etag else {}
+
+        part_path = out_path + ".part"
+        fd = os.open(part_path, _OPEN_FLAGS, 0o644)
+        try:
+            _preallocate(fd, total)
+            os.ftruncate(fd, total)
+            with ThreadPoolExecutor(max_workers=parts - 1) as ex:
+                futures = [
+                    ex.submit(
+                        _fetch_range,
+                        blob_url,
+                        part_headers,
+                        fd,
+                        start,
+                        min(start + part_size, total) - 1,
+                    )
+                    for start in range(part_size, total, part_size)
+                ]
+                _pwrite_body(first, fd, 0, min(part_size, total) - 1)
+                for fut in futures:
+                    fut.result()
+        except BaseException:
+            os.close(fd)
+            _discard(part_path)
+            raise
+        os.close(fd)
+
+        _stamp_mtime(part_path, first.headers.get("Last-Modified"))
+        os.replace(part_path, out_path)
+
+
+def _fetch_range(blob_url: str, headers: dict, fd: int, start: int, end: int):
+    """Fetch bytes start..end (inclusive) of a blob into the same offsets of fd."""
+    range_headers = {**headers, "Range": f"bytes={start}-{end}"}
+    with _session().get(
+        blob_url, headers=range_headers, stream=True, timeout=DEFAULT_TIMEOUT
+    ) as resp:
+        resp.raise_for_status()
+        if resp.status_code != 206:
+            _raise_http_error(
+                f"Range {start}-{end} was not honoured (HTTP {resp.status_code})", resp
+            )
+        _pwrite_body(resp, fd, start, end)
+
+
+def _pwrite_body(resp, fd: int, start: int, end: int):
+    """Write a streamed range body into fd at bytes start..end (inclusive).
+
+    Raises if the body ends early: the file is already preallocated to full
+    size, so a short range would otherwise leave zeros behind. urllib3 1.x
+    does not enforce Content-Length itself.
+    """
+    offset = start
+    for chunk in _iter_body(resp):
+        offset += os.pwrite(fd, chunk, offset)
+    if offset != end + 1:
+        _raise_http_error(
+            f"Range {start}-{end} ended after {offset - start} of {end - start + 1} bytes", resp
+        )
+
+
+def _raise_http_error(message: str, resp):
+    """Raise requests.HTTPError for `resp` (requests is only imported on use)."""
+    from requests import HTTPError
+
+    raise HTTPError(message, response=resp)
+
+
+def _write_stream(resp, out_path: str):
+    """Stream a whole response body to out_path and stamp its Last-Modified.
+
+    The body goes to `out_path + ".part"` first and is moved into place only
+    once complete, so out_path never holds a partial or preallocated body,
+    even if the process is killed mid-download.
+    """
+    # Content-Length is the encoded size, so only trust it for plain bodies.
+    size = int(resp.headers.get("Content-Length") or 0)
+    if resp.headers.get("Content-Encoding"):
+        size = 0
+
+    part_path = out_path + ".part"
+    fd = os.open(part_path, _OPEN_FLAGS, 0o644)
+    try:
+        with os.fdopen(fd, "wb", buffering=0) as f:
+            _preallocate(fd, size)
+            written = 0
+            for chunk in _iter_body(resp):
+                written += f.write(chunk)
+            # Drop any reserved tail if the body came up short.
+            f.truncate(written)
+    except BaseException:
+        _discard(part_path)
+        raise
+
+    _stamp_mtime(part_path, resp.headers.get("Last-Modified"))
+    os.replace(part_path, out_path)
+
+
+def _preallocate(fd: int, size: int):
+    """Reserve extents up front to avoid fragmentation on large blobs."""
+    if size and hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+        except OSError:
+            pass  # Not supported by this filesystem; just write.
+
+
+def _discard(path: str):
+    """Remove a partially written file, ignoring errors."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _stamp_mtime(path: str, last_modified: str | None):
+    """Stamp the file with the blob's Last-Modified so later runs can tell it is current."""
+    if last_modified:
+        mtime = _http_timestamp(last_modified)
+        os.utime(path, (mtime, mtime))
 
 
 def _parse_last_modified(date_str: str) -> datetime:
@@ -110,6 +432,14 @@ def _parse_last_modified(date_str: str) -> datetime:
     return parsedate_to_datetime(date_str)
 
 
+def _http_timestamp(date_str: str) -> int:
+    """Convert an HTTP date (RFC 1123) into whole POSIX seconds."""
+    dt = _parse_last_modified(date_str)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
 def _parse_yyyy_mm_dd(value: str) -> date:
     """Parse a YYYY-MM-DD string into a date."""
     try:
@@ -118,52 +448,176 @@ def _parse_yyyy_mm_dd(value: str) -> date:
         raise ValueError(f"Invalid date '{value}'. Expected YYYY-MM-DD.") from exc
 
 
-def _blob_modified_date(blob: dict) -> date | None:
-    """Return blob last-modified as a UTC calendar date."""
-    if not blob.get("last_modified"):
+_MONTHS = {
+    name: number
+    for number, name in enumerate(
+        ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"),
+        start=1,
+    )
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def _gmt_day(day: str) -> date | None:
+    """Parse the "DD Mon YYYY" part of an RFC 1123 date, or None if malformed."""
+    month = _MONTHS.get(day[3:6])
+    if not month or not (day[:2].isdigit() and day[7:].isdigit()):
         return None
-    dt = _parse_last_modified(blob["last_modified"])
+    return date(int(day[7:]), month, int(day[:2]))
+
+
+def _last_modified_date(value: str) -> date:
+    """Return a Last-Modified header value as a UTC calendar date."""
+    # Azure always sends fixed-width GMT, e.g. "Tue, 11 Feb 2026 12:00:00 GMT",
+    # so the date can be sliced out without building a datetime. Caching on
+    # the day rather than the full timestamp lets blobs from the same day
+    # share one parse.
+    if len(value) == 29 and value.endswith(" GMT"):
+        day = _gmt_day(value[5:16])
+        if day is not None:
+            return day
+
+    dt = _parse_last_modified(value)
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=timezone.utc)
     return dt.astimezone(timezone.utc).date()
 
 
-def _download_filtered(blobs: list[dict], label: str, dest_dir: str, sas_url: str):
-    """Download a pre-filtered blob list with consistent logging."""
-    print(f"Found {len(blobs)} blob(s) {label}. Downloading...")
-    for blob in blobs:
-        path = download_blob(blob["name"], dest_dir, sas_url)
-        print(f"  -> {path} ({blob['last_modified']})")
-    print("Done.")
+def _modified_within(start: date | None = None, end: date | None = None):
+    """Build a predicate matching blobs last modified within [start, end] (UTC dates).
+
+    Either bound may be omitted. The bounds and parser are bound once so the
+    per-blob check is a single cached parse and a chained comparison.
+    """
+    lo = start or date.min
+    hi = end or date.max
+    parse = _last_modified_date
+
+    def matches(blob: Blob) -> bool:
+        last_modified = blob.last_modified
+        return bool(last_modified) and lo <= parse(last_modified) <= hi
+
+    return matches
 
 
-def download_all(dest_dir: str = "downloads", sas_url: str = BASE_SAS_URL):
-    """Download every blob in the container."""
-    blobs = list_blobs(sas_url)
-    print(f"Found {len(blobs)} blob(s). Downloading...")
-    for blob in blobs:
-        path = download_blob(blob["name"], dest_dir, sas_url)
-        print(f"  -> {path}")
-    print("Done.")
+def _download_filtered(
+    blobs: Iterable[Blob],
+    label: str,
+    dest_dir: str,
+    sas_url: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+):
+    """Download blobs as they are listed, with consistent logging.
+
+    Every download command funnels through here so they share one worker pool
+    and one set of pooled connections. Downloads start while later list pages
+    are still being fetched; the number of queued downloads is bounded so a
+    huge listing doesn't pile up in memory.
+    """
+    workers = max(1, concurrency)
+    # Every worker may be fetching a large blob in PARALLEL_PARTS ranges, plus
+    # one connection for the listing's page requests.
+    _session(workers * PARALLEL_PARTS + 1)
+    print(f"Downloading blobs {label}..." if label else "Downloading blobs...")
+    count = unchanged = 0
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        pending = {}
+
+        def report(done):
+            # Workers never print; completed downloads are logged here in one
+            # write per batch instead of one print per blob. A failed download
+            # doesn't hide the rest of its batch: every finished blob is logged
+            # before the first error is re-raised.
+            nonlocal unchanged
+            lines = []
+            error = None
+            try:
+                for fut in done:
+                    blob = pending.pop(fut)
+                    try:
+                        path = fut.result()
+                    except Exception as exc:
+                        if error is None:
+                            error = exc
+                        continue
+                    if path is None:
+                        unchanged += 1
+                        lines.append(f"  == {os.path.join(dest_dir, blob.name)} (unchanged)\n")
+                    else:
+                        lines.append(f"  -> {path} ({blob.last_modified})\n")
+            finally:
+                sys.stdout.write("".join(lines))
+                sys.stdout.flush()
+            if error is not None:
+                raise error
+
+        try:
+            for blob in blobs:
+                if len(pending) >= workers * 4:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    report(done)
+                fut = ex.submit(
+                    download_blob,
+                    blob.name,
+                    dest_dir,
+                    sas_url,
+                    blob.size,
+                    blob.last_modified,
+                    blob.content_encoding,
+                )
+                pending[fut] = blob
+                count += 1
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                report(done)
+        except BaseException:
+            # Fail fast on an error or Ctrl-C: drop queued downloads instead
+            # of letting the pool drain them before the exception surfaces,
+            # but still log the ones that finished while shutting down.
+            ex.shutdown(cancel_futures=True)
+            finished = [fut for fut in pending if not fut.cancelled()]
+            try:
+                report(finished)
+            except Exception:
+                pass  # Already propagating the first failure.
+            raise
+    print(f"Done. {count - unchanged} downloaded, {unchanged} unchanged.")
+
+
+def download_all(
+    dest_dir: str = "downloads",
+    sas_url: str = BASE_SAS_URL,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    prefix: str | None = None,
+):
+    """Download every blob in the container (optionally only names under `prefix`)."""
+    _download_filtered(iter_blobs(sas_url, prefix), "", dest_dir, sas_url, concurrency)
 
 
-def download_since(since: str, dest_dir: str = "downloads", sas_url: str = BASE_SAS_URL):
+def download_since(
+    since: str,
+    dest_dir: str = "downloads",
+    sas_url: str = BASE_SAS_URL,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    prefix: str | None = None,
+):
     """Download blobs modified on or after `since` (YYYY-MM-DD)."""
     cutoff = _parse_yyyy_mm_dd(since)
-    blobs = list_blobs(sas_url)
-    filtered = [
-        b for b in blobs
-        if (modified_date := _blob_modified_date(b)) and modified_date >= cutoff
-    ]
-    _download_filtered(filtered, f"modified since {since}", dest_dir, sas_url)
+    filtered = filter(_modified_within(start=cutoff), iter_blobs(sas_url, prefix))
+    _download_filtered(filtered, f"modified since {since}", dest_dir, sas_url, concurrency)
 
 
-def download_date(target_date: str, dest_dir: str = "downloads", sas_url: str = BASE_SAS_URL):
+def download_date(
+    target_date: str,
+    dest_dir: str = "downloads",
+    sas_url: str = BASE_SAS_URL,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    prefix: str | None = None,
+):
     """Download blobs modified on an exact UTC date (YYYY-MM-DD)."""
     target = _parse_yyyy_mm_dd(target_date)
-    blobs = list_blobs(sas_url)
-    filtered = [b for b in blobs if _blob_modified_date(b) == target]
-    _download_filtered(filtered, f"modified on {target_date}", dest_dir, sas_url)
+    filtered = filter(_modified_within(target, target), iter_blobs(sas_url, prefix))
+    _download_filtered(filtered, f"modified on {target_date}", dest_dir, sas_url, concurrency)
 
 
 def download_range(
@@ -171,6 +625,8 @@ def download_range(
     end_date: str,
     dest_dir: str = "downloads",
     sas_url: str = BASE_SAS_URL,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    prefix: str | None = None,
 ):
     """Download blobs modified in an inclusive UTC date range (YYYY-MM-DD to YYYY-MM-DD)."""
     start = _parse_yyyy_mm_dd(start_date)
@@ -178,12 +634,52 @@ def download_range(
     if end < start:
         raise ValueError("End date must be the same as or after start date.")
 
-    blobs = list_blobs(sas_url)
-    filtered = [
-        b for b in blobs
-        if (modified_date := _blob_modified_date(b)) and start <= modified_date <= end
-    ]
-    _download_filtered(filtered, f"from {start_date} to {end_date}", dest_dir, sas_url)
+    filtered = filter(_modified_within(start, end), iter_blobs(sas_url, prefix))
+    _download_filtered(
+        filtered, f"from {start_date} to {end_date}", dest_dir, sas_url, concurrency
+    )
+
+
+def _cmd_list(args, sas_url: str):
+    blobs = list_blobs(sas_url, args.prefix)
+    print(f"{'Name':<60} {'Size':>10}  {'Last Modified'}")
+    print("-" * 100)
+    for b in blobs:
+        size_kb = f"{b.size / 1024:.1f} KB" if b.size else "?"
+        print(f"{b.name:<60} {size_kb:>10}  {b.last_modified or '?'}")
+    print(f"\nTotal: {len(blobs)} blob(s)")
+
+
+def _cmd_download_all(args, sas_url: str):
+    download_all(args.output, sas_url, args.concurrency, args.prefix)
+
+
+def _cmd_download_since(args, sas_url: str):
+    download_since(args.date, args.output, sas_url, args.concurrency, args.prefix)
+
+
+def _cmd_download_date(args, sas_url: str):
+    download_date(args.date, args.output, sas_url, args.concurrency, args.prefix)
+
+
+def _cmd_download_range(args, sas_url: str):
+    download_range(
+        args.start_date,
+        args.end_date,
+        args.output,
+        sas_url,
+        args.concurrency,
+        args.prefix,
+    )
+
+
+HANDLERS = {
+    "list": _cmd_list,
+    "download-all": _cmd_download_all,
+    "download-since": _cmd_download_since,
+    "download-date": _cmd_download_date,
+    "download-range": _cmd_download_range,
+}
 
 
 def main():
@@ -191,27 +687,48 @@ def main():
     sub = parser.add_subparsers(dest="command", required=True)
 
     # list
-    sub.add_parser("list", help="List all blobs in the container")
+    ls = sub.add_parser("list", help="List all blobs in the container")
+    ls.add_argument("--prefix", help="Only include blob names starting with this prefix")
 
     # download-all
     dl_all = sub.add_parser("download-all", help="Download every blob")
     dl_all.add_argument("-o", "--output", default="downloads", help="Output directory")
+    dl_all.add_argument(
+        "-j", "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+        help=f"Parallel downloads (default: {DEFAULT_CONCURRENCY})",
+    )
+    dl_all.add_argument("--prefix", help="Only include blob names starting with this prefix")
 
     # download-since
     dl_since = sub.add_parser("download-since", help="Download blobs modified since a date")
     dl_since.add_argument("date", help="Cutoff date (YYYY-MM-DD)")
     dl_since.add_argument("-o", "--output", default="downloads", help="Output directory")
+    dl_since.add_argument(
+        "-j", "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+        help=f"Parallel downloads (default: {DEFAULT_CONCURRENCY})",
+    )
+    dl_since.add_argument("--prefix", help="Only include blob names starting with this prefix")
 
     # download-date
     dl_date = sub.add_parser("download-date", help="Download blobs modified on an exact date")
     dl_date.add_argument("date", help="Target date (YYYY-MM-DD)")
     dl_date.add_argument("-o", "--output", default="downloads", help="Output directory")
+    dl_date.add_argument(
+        "-j", "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+        help=f"Parallel downloads (default: {DEFAULT_CONCURRENCY})",
+    )
+    dl_date.add_argument("--prefix", help="Only include blob names starting with this prefix")
 
     # download-range
     dl_range = sub.add_parser("download-range", help="Download blobs modified in a date range")
     dl_range.add_argument("start_date", help="Range start date (YYYY-MM-DD)")
     dl_range.add_argument("end_date", help="Range end date (YYYY-MM-DD)")
     dl_range.add_argument("-o", "--output", default="downloads", help="Output directory")
+    dl_range.add_argument(
+        "-j", "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+        help=f"Parallel downloads (default: {DEFAULT_CONCURRENCY})",
+    )
+    dl_range.add_argument("--prefix", help="Only include blob names starting with this prefix")
 
     parser.add_argument("--sas-url", default=BASE_SAS_URL, help="Full SAS URL (overrides .env)")
 
@@ -222,26 +739,7 @@ def main():
         parser.error("No SAS URL found. Set BASE_SAS_URL in .env or pass --sas-url.")
 
     try:
-        if args.command == "list":
-            blobs = list_blobs(sas_url)
-            print(f"{'Name':<60} {'Size':>10}  {'Last Modified'}")
-            print("-" * 100)
-            for b in blobs:
-                size_kb = f"{b['size'] / 1024:.1f} KB" if b["size"] else "?"
-                print(f"{b['name']:<60} {size_kb:>10}  {b['last_modified'] or '?'}")
-            print(f"\nTotal: {len(blobs)} blob(s)")
-
-        elif args.command == "download-all":
-            download_all(args.output, sas_url)
-
-        elif args.command == "download-since":
-            download_since(args.date, args.output, sas_url)
-
-        elif args.command == "download-date":
-            download_date(args.date, args.output, sas_url)
-
-        elif args.command == "download-range":
-            download_range(args.start_date, args.end_date, args.output, sas_url)
+        HANDLERS[args.command](args, sas_url)
     except ValueError as exc:
         parser.error(str(exc))
 